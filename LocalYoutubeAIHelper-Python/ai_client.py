@@ -1,15 +1,134 @@
+import functools
+import importlib.util
+import threading
+import time
+from collections import deque
+import httpx
 from openai import AzureOpenAI
-from openai import OpenAI, RateLimitError
+from openai import OpenAI, DefaultHttpxClient, RateLimitError, APIConnectionError, InternalServerError, NOT_GIVEN
 from tenacity import retry, wait_random_exponential, stop_after_attempt, retry_if_exception_type
 from utilities import setup_logging
 
 logger = setup_logging()
 
+# Errors worth retrying: throttling, dropped connections/timeouts and transient 5xx responses
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+# While a stream is being read a dropped connection surfaces as a plain httpx error
+STREAM_RETRYABLE_ERRORS = RETRYABLE_ERRORS + (httpx.TransportError,)
+
+# The HTTP client shared by every OpenAI client in the process
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def _get_http_client(concurrency=0):
+    """
+    Returns the HTTP client shared by all OpenAI clients, keeping TLS connections
+    alive between requests. HTTP/2 is used when the optional 'h2' package is installed.
+    The client is created once, sized from the concurrency of the first caller;
+    later calls return the same client whatever they pass. The pool keeps at
+    least one idle connection per concurrent worker, so bursts after a pause
+    reuse warm connections instead of opening new TLS sessions.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            transport = httpx.HTTPTransport(
+                http2=importlib.util.find_spec('h2') is not None,
+                limits=httpx.Limits(
+                    max_connections=max(64, 2 * concurrency),
+                    max_keepalive_connections=max(32, concurrency),
+                    keepalive_expiry=300.0
+                ),
+                retries=3  # Transparently reconnect when a pooled connection cannot be established
+            )
+            _http_client = DefaultHttpxClient(
+                transport=transport,
+                timeout=httpx.Timeout(600.0, connect=5.0)
+            )
+        return _http_client
+
+@functools.cache
+def _get_openai_client(api_key):
+    """
+    Returns a shared OpenAI client so every AIClient reuses one connection pool.
+    """
+    return OpenAI(api_key=api_key, http_client=_get_http_client())
+
+@functools.cache
+def _get_azure_client(api_key, api_version, azure_endpoint):
+    """
+    Returns a shared Azure OpenAI client for the given endpoint and API version.
+    """
+    return AzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        azure_endpoint=azure_endpoint,
+        http_client=_get_http_client()
+    )
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window limiter for requests and tokens per minute.
+    A limit of 0 disables the corresponding check.
+    """
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0, period=60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.period = period
+        self._requests = deque()
+        self._tokens = deque()
+        self._token_total = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until another request fits into the current window and records it.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._expire(now)
+                wait = 0
+                if self.requests_per_minute and len(self._requests) >= self.requests_per_minute:
+                    wait = self._requests[0] + self.period - now
+                if self.tokens_per_minute and self._token_total >= self.tokens_per_minute:
+                    wait = max(wait, self._tokens[0][0] + self.period - now)
+                if wait <= 0:
+                    self._requests.append(now)
+                    return
+            logger.debug(f"Rate limit reached, waiting {wait:.1f}s")
+            time.sleep(wait)
+
+    def record_tokens(self, tokens):
+        """
+        Records tokens consumed by a completed request.
+        """
+        if not self.tokens_per_minute or not tokens:
+            return
+        with self._lock:
+            self._tokens.append((time.monotonic(), tokens))
+            self._token_total += tokens
+
+    def _expire(self, now):
+        cutoff = now - self.period
+        while self._requests and self._requests[0] <= cutoff:
+            self._requests.popleft()
+        while self._tokens and self._tokens[0][0] <= cutoff:
+            self._token_total -= self._tokens.popleft()[1]
+
 class AIClient:
     def __init__(self, config, whisper_config):
         self.config = config
         self.whisper_config = whisper_config
         self.use_azure = config['use_azure_openai']
+        # Size the shared connection pool for the most parallel stage of the pipeline.
+        # Only the first AIClient sizes it, main creates the transcriber (which sees
+        # every concurrency setting) before the prompt processor
+        _get_http_client(max(
+            int(config.get('prompt_concurrency') or 0),
+            int((whisper_config or {}).get('whisper_concurrency') or 0),
+            int((whisper_config or {}).get('improve_concurrency') or 0)
+        ))
         if self.use_azure:
             self.endpoint = config['azure_openai_endpoint']
             self.api_key = config['azure_openai_api_key']
@@ -17,13 +136,13 @@ class AIClient:
             self.deployment_name = config['azure_deployment_name']
             if not all([self.endpoint, self.api_key, self.api_version, self.deployment_name]):
                 raise ValueError("Azure OpenAI configuration is incomplete.")
-            self.client = AzureOpenAI(
-                api_key=self.api_key,  
+            self.client = _get_azure_client(
+                api_key=self.api_key,
                 api_version=self.api_version,
                 azure_endpoint=self.endpoint
             )
             if whisper_config:
-                self.whisperclient = AzureOpenAI(
+                self.whisperclient = _get_azure_client(
                     api_key=self.api_key,
                     api_version=self.whisper_config.get('azure_openai_api_version',self.api_version),
                     azure_endpoint=self.endpoint
@@ -33,16 +152,62 @@ class AIClient:
             self.api_key = config['openai_api_key']
             if not self.api_key:
                 raise ValueError("OpenAI API key is missing.")
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = _get_openai_client(self.api_key)
             logger.info(f"Successfully initialized OpenAI client. Model will be used: {self.config['default_model']}")
 
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=int(config.get('requests_per_minute') or 0),
+            tokens_per_minute=int(config.get('tokens_per_minute') or 0)
+        )
+
 
     @retry(
     wait=wait_random_exponential(min=1, max=60),
     stop=stop_after_attempt(6),
-    retry=retry_if_exception_type(RateLimitError)
+    retry=retry_if_exception_type(RETRYABLE_ERRORS)
     )
     def create_chat_completion(self, messages, **kwargs):
+        self.rate_limiter.acquire()
+        response = self._create_chat_completion(messages, **kwargs)
+        if getattr(response, 'usage', None):
+            self.rate_limiter.record_tokens(response.usage.total_tokens)
+        return response
+
+    def stream_chat_completion(self, messages, **kwargs):
+        """
+        Streams a chat completion, yielding content fragments as they arrive.
+        Failures are not retried here, since fragments may already have been
+        consumed. Callers retry the whole stream on STREAM_RETRYABLE_ERRORS.
+
+        Args:
+            messages (list): List of messages for the API.
+
+        Yields:
+            str: Content fragments of the assistant response.
+
+        Raises:
+            ValueError: If the response ended for any reason other than 'stop',
+                for example when it was cut off by the token limit or a content filter.
+        """
+        self.rate_limiter.acquire()
+        # Usage is only reported in the final chunk when explicitly requested
+        if self.rate_limiter.tokens_per_minute:
+            kwargs['stream_options'] = {"include_usage": True}
+        stream = self._create_chat_completion(messages, stream=True, **kwargs)
+
+        finish_reason = None
+        for chunk in stream:
+            if chunk.usage:
+                self.rate_limiter.record_tokens(chunk.usage.total_tokens)
+            if chunk.choices:
+                choice = chunk.choices[0]
+                if choice.delta and choice.delta.content:
+                    yield choice.delta.content
+                finish_reason = choice.finish_reason or finish_reason
+        if finish_reason != 'stop':
+            raise ValueError(f"Incomplete response, finish reason: {finish_reason}")
+
+    def _create_chat_completion(self, messages, **kwargs):
         if self.use_azure:
             return self.client.chat.completions.create(
                 model=kwargs.get('deployment_name', self.deployment_name),
@@ -50,7 +215,9 @@ class AIClient:
                 max_tokens=int(kwargs.get('max_tokens', self.config.get('max_tokens',4000))),
                 temperature=float(kwargs.get('temperature', self.config.get('temperature', 0.7))),
                 top_p=float(kwargs.get('top_p', self.config.get('top_p', 1.0))),
-                response_format=kwargs.get('response_format',None)
+                response_format=kwargs.get('response_format',None),
+                stream=kwargs.get('stream', False),
+                stream_options=kwargs.get('stream_options', NOT_GIVEN)
             )
 
         else:
@@ -60,15 +227,19 @@ class AIClient:
                 max_tokens=int(kwargs.get('max_tokens', self.config.get('max_tokens',4000))),
                 temperature=float(kwargs.get('temperature', self.config.get('temperature', 0.7))),
                 top_p=float(kwargs.get('top_p', self.config.get('top_p', 1.0))),
-                response_format=kwargs.get('response_format',None)
+                response_format=kwargs.get('response_format',None),
+                stream=kwargs.get('stream', False),
+                stream_options=kwargs.get('stream_options', NOT_GIVEN)
             )
                 
     @retry(
     wait=wait_random_exponential(min=1, max=60),
     stop=stop_after_attempt(6),
-    retry=retry_if_exception_type(RateLimitError)
+    retry=retry_if_exception_type(RETRYABLE_ERRORS)
     )
     def transcribe_audio(self, audio_file, **kwargs):
+        # Rewind so a retried attempt uploads the whole file again
+        audio_file.seek(0)
         if self.use_azure:
             return self.whisperclient.audio.transcriptions.create(
                 file=audio_file,
@@ -1,4 +1,5 @@
 import os
+import sys
 import argparse
 from downloader import Downloader
 from transcriber import Transcriber
@@ -26,6 +27,8 @@ def parse_arguments():
     parser_full.add_argument('inputs', nargs='+', help="YouTube URLs, video IDs, or local file paths to process")
     parser_full.add_argument('--update-youtube', action='store_true', help="Update YouTube videos after processing (default: False)")
     parser_full.add_argument('--disable-improve-srt', action='store_true', help="Disable automatic improvement of transcribed SRT (default: False)", default=False)
+    parser_full.add_argument('--force', action='store_true', help="Re-run prompts even if their outputs are up to date (default: False)")
+    parser_full.add_argument('--no-cache', action='store_true', help="Do not reuse cached SRT improvements from previous runs (default: False)")
     
     # Download YouTube videos
     parser_download = subparsers.add_parser('download', help="Download YouTube videos")
@@ -38,14 +41,16 @@ def parse_arguments():
     #Improve transcript
     parser_improve_transcript = subparsers.add_parser('improve-srt',help="Improve automatically transcribed SRT")
     parser_improve_transcript.add_argument('folders', nargs='+', help="Folders containing transcribed files")
+    parser_improve_transcript.add_argument('--no-cache', action='store_true', help="Do not reuse cached SRT improvements from previous runs (default: False)")
 
     # Process prompts on transcriptions
     parser_prompts = subparsers.add_parser('process-prompts', help="Process prompts on transcribed files")
     parser_prompts.add_argument('folders', nargs='+', help="Folders containing transcribed files")
+    parser_prompts.add_argument('--force', action='store_true', help="Re-run prompts even if their outputs are up to date (default: False)")
 
     # Update YouTube videos
     parser_update = subparsers.add_parser('update-youtube', help="Update YouTube videos using folder details")
-    parser_update.add_argument('folder', help="Folder containing file_details.txt and optional metadata files")
+    parser_update.add_argument('folders', nargs='+', help="Folders containing file_details.txt and optional metadata files")
 
     return parser.parse_args()
 
@@ -59,6 +64,11 @@ def main():
     if args.config_folder:
         config, whisper_config = load_config_from_folder(args.config_folder)
 
+    if getattr(args, 'force', False):
+        config['force_prompts'] = True
+    if getattr(args, 'no_cache', False):
+        config['no_cache'] = True
+
     # Initialize components
     downloader = Downloader(config)
     transcriber = Transcriber(config, whisper_config)
@@ -114,7 +124,8 @@ def main():
         prompt_processor.process_prompts_on_transcripts(args.folders)
 
     elif args.mode == 'update-youtube':
-        youtube_updater.process_update_youtube(args.folder)
+        if youtube_updater.process_folders(args.folders):
+            sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,56 @@
 import os
-import json
 import re
-from ai_client import AIClient
+import threading
+from ai_client import AIClient, STREAM_RETRYABLE_ERRORS
+from tenacity import retry, wait_random_exponential, stop_after_attempt, retry_if_exception_type
 import concurrent.futures
-from utilities import setup_logging, load_file_content, load_variable_content, save_file_content, ensure_directory_exists
+from utilities import setup_logging, load_file_content, load_variables_content, save_file_content, ensure_directory_exists, load_json, prefetch_file, mmap_file_content, find_latest_numbered_files
 from config import CONFIG
 
+try:
+    import fastjsonschema
+except ImportError:  # Optional dependency, responses are not validated locally without it
+    fastjsonschema = None
+
 logger = setup_logging()
 
+# Transcripts larger than this are read through a memory map
+MMAP_THRESHOLD = 1024 * 1024
+
+# Matches {{variable}} placeholders in generated files
+_VAR_RE = re.compile(r'\{\{(.*?)\}\}')
+
+class _FolderTranscripts:
+    """
+    Transcripts of one folder, read once on first use and shared by all of its prompts.
+    """
+    def __init__(self, paths):
+        self.paths = paths
+        self._contents = {}
+        self._lock = threading.Lock()
+
+    def read(self, kind):
+        """
+        Returns the content of a transcript, reading it on the first call.
+
+        Args:
+            kind (str): Transcript kind ('txt' or 'llmsrt').
+
+        Returns:
+            str: Transcript content.
+        """
+        with self._lock:
+            if kind not in self._contents:
+                self._contents[kind] = PromptProcessor._read_transcript(self.paths[kind])
+            return self._contents[kind]
+
+    def release(self):
+        """
+        Drops the transcript contents once no prompt needs them anymore.
+        """
+        with self._lock:
+            self._contents.clear()
+
 class PromptProcessor:
     def __init__(self, config):
         """
@@ -19,7 +62,13 @@ class PromptProcessor:
         self.config = config
         self.prompts_folder = config.get('prompts_folder', 'prompts')
         self.openai_api_key = config.get('openai_api_key')
-        
+        # {prompt_path: (content, mtime, schema_or_none, schema_mtime_or_none)}
+        self._prompt_cache = {}
+        # Regenerate outputs even when they are newer than their inputs
+        self.force = str(config.get('force_prompts', False)).lower() == 'true'
+        # {prompt_path: compiled JSON schema validator}
+        self._validators = {}
+
         self.client = AIClient(self.config, None)
 
     def process_prompts_on_transcripts(self, folders):
@@ -29,35 +78,58 @@ class PromptProcessor:
         Args:
             folders (list): List of folder paths containing transcriptions.
         """
+        # Prompts are shared by all folders, so list and load them only once
+        prompt_files = self._get_prompt_files()
+        if not prompt_files:
+            logger.error(f"No prompt files found in folder: {self.prompts_folder}")
+            return
+
+        # Resolve transcripts first and let the OS read them ahead in the background
+        folder_transcripts = []
         for folder in folders:
             if not os.path.exists(folder):
                 logger.error(f"Folder not found: {folder}")
                 continue
 
-            logger.info(f"Processing prompts in folder: {folder}")
-
-            # Load transcription files
-            transcribed_files = self._load_transcription_files(folder)
-
-            # Find all prompt files
-            prompt_files = self._get_prompt_files()
-            if not prompt_files:
-                logger.error(f"No prompt files found in folder: {self.prompts_folder}")
-                return
-
-            generated_files = []
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = [
-                    executor.submit(self._process_single_prompt, prompt_file, transcribed_files, folder)
-                    for prompt_file in prompt_files
-                ]
-                for future in concurrent.futures.as_completed(futures):
-                    result = future.result()
-                    if result:
-                        generated_files.append(result)
-
-            # Substitute variables in generated files
-            self._substitute_variables_in_files(folder, generated_files)
+            try:
+                transcribed_files = self._load_transcription_files(folder)
+            except OSError as e:
+                logger.error(f"Error listing transcripts in folder {folder}: {e}")
+                continue
+            for kind in ('txt', 'llmsrt'):
+                if transcribed_files[kind]:
+                    prefetch_file(transcribed_files[kind])
+            folder_transcripts.append((folder, _FolderTranscripts(transcribed_files)))
+
+        pending = {folder: len(prompt_files) for folder, _ in folder_transcripts}
+        generated_by_folder = {folder: [] for folder in pending}
+
+        # A single pool works across all folders. Transcripts are only read by the first
+        # prompt that needs them and released once every prompt of the folder has finished
+        max_workers = int(self.config.get('prompt_concurrency') or 0) or None
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for folder, transcripts in folder_transcripts:
+                logger.info(f"Processing prompts in folder: {folder}")
+                for prompt_file in prompt_files:
+                    future = executor.submit(self._process_single_prompt, prompt_file, transcripts, folder)
+                    futures[future] = (folder, transcripts)
+            del folder_transcripts
+
+            for future in concurrent.futures.as_completed(futures):
+                folder, transcripts = futures.pop(future)
+                result = future.result()
+                if result:
+                    generated_by_folder[folder].append(result)
+
+                # Substitute variables once every prompt of the folder has finished
+                pending[folder] -= 1
+                if pending[folder] == 0:
+                    transcripts.release()
+                    try:
+                        self._substitute_variables_in_files(folder, generated_by_folder[folder])
+                    except Exception as e:
+                        logger.error(f"Error substituting variables in folder {folder}: {e}")
 
     def _load_transcription_files(self, folder):
         """
@@ -69,12 +141,29 @@ class PromptProcessor:
         Returns:
             dict: Dictionary containing paths to transcription files.
         """
-        base_path = os.path.join(folder, 'transcript')
-        return {
-            'txt': f"{base_path}.txt" if os.path.exists(f"{base_path}.txt") else None,
-            'srt': f"{base_path}.srt" if os.path.exists(f"{base_path}.srt") else None,
-            'llmsrt': f"{base_path}.llmsrt" if os.path.exists(f"{base_path}.llmsrt") else None,
-        }
+        wanted = {'transcript.txt': 'txt', 'transcript.srt': 'srt', 'transcript.llmsrt': 'llmsrt'}
+        found = {}
+        # A single directory scan instead of one existence check per transcript type
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name in wanted and entry.is_file():
+                    found[wanted[entry.name]] = entry.path
+        return {key: found.get(key) for key in ('txt', 'srt', 'llmsrt')}
+
+    @staticmethod
+    def _read_transcript(path):
+        """
+        Reads a transcript, memory-mapping large files.
+
+        Args:
+            path (str): Path to the transcript file.
+
+        Returns:
+            str: Transcript content.
+        """
+        if os.path.getsize(path) > MMAP_THRESHOLD:
+            return mmap_file_content(path)
+        return load_file_content(path)
 
     def _get_prompt_files(self):
         """
@@ -83,49 +172,69 @@ class PromptProcessor:
         Returns:
             list: List of prompt file paths.
         """
-        if not os.path.exists(self.prompts_folder):
-            return []
-        return [
-            os.path.join(self.prompts_folder, f)
-            for f in os.listdir(self.prompts_folder)
-            if f.endswith('.txt') or f.endswith('.srt')
-        ]
+        self._refresh_prompt_cache()
+        return list(self._prompt_cache)
 
-    def _process_single_prompt(self, prompt_file, transcribed_files, folder):
+    def _refresh_prompt_cache(self):
+        """
+        Loads prompt files and their optional JSON schemas into memory.
+        Entries are only reloaded when the modification time of the prompt file
+        or of its schema changes.
+        """
+        if not os.path.exists(self.prompts_folder):
+            self._prompt_cache = {}
+            return
+
+        cache = {}
+        with os.scandir(self.prompts_folder) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith(('.txt', '.srt')):
+                    continue
+                mtime = entry.stat().st_mtime
+                prompt_name = os.path.splitext(entry.name)[0]
+                schema_file = os.path.join(self.prompts_folder, f"{prompt_name}.schema.json")
+                try:
+                    schema_mtime = os.stat(schema_file).st_mtime
+                except FileNotFoundError:
+                    schema_mtime = None
+                cached = self._prompt_cache.get(entry.path)
+                if cached and cached[1] == mtime and cached[3] == schema_mtime:
+                    cache[entry.path] = cached
+                    continue
+
+                schema = load_json(load_file_content(schema_file)) if schema_mtime is not None else None
+                cache[entry.path] = (load_file_content(entry.path), mtime, schema, schema_mtime)
+                self._validators.pop(entry.path, None)
+                if schema is not None and fastjsonschema is not None:
+                    try:
+                        self._validators[entry.path] = fastjsonschema.compile(schema)
+                    except Exception as e:
+                        logger.warning(f"Could not compile JSON schema for '{prompt_name}': {e}")
+        self._prompt_cache = cache
+
+    def _process_single_prompt(self, prompt_file, transcripts, folder):
         """
         Processes a single prompt on the transcriptions.
 
         Args:
             prompt_file (str): Path to the prompt file.
-            transcribed_files (dict): Paths to transcription files.
+            transcripts (_FolderTranscripts): Transcripts of the folder, read on first use.
             folder (str): Folder where generated files will be saved.
         """
         try:
             prompt_name = os.path.splitext(os.path.basename(prompt_file))[0]
-            prompt_content = load_file_content(prompt_file)
+            prompt_content, prompt_mtime, schema, schema_mtime = self._prompt_cache[prompt_file]
 
-            # Determine the appropriate transcription file to use
-            if prompt_file.endswith('.srt'):
-                transcription_file = transcribed_files.get('llmsrt')
-            else:
-                transcription_file = transcribed_files.get('txt')
+            # Determine the appropriate transcription to use
+            transcript_kind = 'llmsrt' if prompt_file.endswith('.srt') else 'txt'
+            transcription_file = transcripts.paths[transcript_kind]
 
             if not transcription_file:
                 logger.error(f"Transcription file not found for prompt: {prompt_file}")
                 return
 
-            # Prepare messages for OpenAI API
-            transcription_content = load_file_content(transcription_file)
-            messages = [
-                {"role": "system", "content": prompt_content},
-                {"role": "user", "content": transcription_content},
-            ]
-
-            # Check for the presence of a corresponding JSON schema file
-            schema_file = os.path.join(os.path.dirname(prompt_file), f"{prompt_name}.schema.json")
-            if os.path.exists(schema_file):
-                # Load the JSON schema
-                schema = json.loads(load_file_content(schema_file))
+            # Use the corresponding JSON schema, if one was found for the prompt
+            if schema is not None:
                 response_format = {
                     "type": "json_schema",
                     "json_schema": {
@@ -139,13 +248,30 @@ class PromptProcessor:
                 response_format = None
                 output_extension = '.prompt.txt'
 
+            # Reuse the latest previous output if it is newer than the prompt, its schema and the transcript.
+            # Outputs are never overwritten, later runs add numbered files such as 'name.2.prompt.txt'
+            existing_output = find_latest_numbered_files((prompt_name,), folder, output_extension)[prompt_name]
+            if not self.force and existing_output and \
+                    os.path.getmtime(existing_output) > max(prompt_mtime, schema_mtime or 0, os.path.getmtime(transcription_file)):
+                logger.info(f"Output is up to date, skipping prompt '{prompt_name}': {existing_output}")
+                return existing_output
+
+            transcription_content = transcripts.read(transcript_kind)
+
+            # Prepare messages for OpenAI API
+            messages = [
+                {"role": "system", "content": prompt_content},
+                {"role": "user", "content": transcription_content},
+            ]
+
             # Generate and save response
             generated_file = self._generate_and_save_response(
                 messages=messages,
                 response_format=response_format,
                 output_extension=output_extension,
                 folder=folder,
-                prompt_name=prompt_name
+                prompt_name=prompt_name,
+                validator=self._validators.get(prompt_file)
             )
 
             return generated_file
@@ -153,7 +279,7 @@ class PromptProcessor:
             logger.error(f"Error processing prompt '{prompt_name}': {e}")
             return None
 
-    def _generate_and_save_response(self, messages, response_format, output_extension, folder, prompt_name):
+    def _generate_and_save_response(self, messages, response_format, output_extension, folder, prompt_name, validator=None):
         """
         Generates a response using OpenAI's API and saves it to a file.
 
@@ -163,19 +289,12 @@ class PromptProcessor:
             output_extension (str): File extension for the output file.
             folder (str): Folder to save the generated response.
             prompt_name (str): Name of the prompt.
+            validator (callable): Optional compiled JSON schema validator for the response.
 
         Returns:
             str: Path to the saved response file.
         """
 
-        # Generate the response using the OpenAI API
-        response = self.client.create_chat_completion(
-            messages=messages,           
-            response_format=response_format
-        )        
-
-        assistant_content = response.choices[0].message.content
-
         # Ensure unique output filename
         output_filename = f"{prompt_name}{output_extension}"
         output_file = os.path.join(folder, output_filename)
@@ -185,18 +304,47 @@ class PromptProcessor:
             output_filename = f"{prompt_name}.{file_number}{output_extension}"
             output_file = os.path.join(folder, output_filename)
 
-        # Save the assistant's response
-        with open(output_file, 'w', encoding='utf-8') as f:
-            if '.json' in output_extension:
-                output_data = json.loads(assistant_content)
-                json.dump(output_data, f, indent=4)
-            else:
-                f.write(assistant_content)
+        # Stream the response straight to disk and only publish it once complete
+        partial_file = f"{output_file}.partial"
+        try:
+            self._stream_response_to_file(messages, response_format, partial_file)
+            if output_extension.endswith('.json'):
+                # JSON outputs are kept as returned, but must parse and match the schema
+                data = load_json(load_file_content(partial_file))
+                if validator is not None:
+                    validator(data)
+            os.replace(partial_file, output_file)
+        except Exception:
+            if os.path.exists(partial_file):
+                os.remove(partial_file)
+            raise
 
         logger.info(f"Saved response to: {output_file}")
         return output_file
 
 
+    @retry(
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(6),
+    retry=retry_if_exception_type(STREAM_RETRYABLE_ERRORS)
+    )
+    def _stream_response_to_file(self, messages, response_format, path):
+        """
+        Streams a chat completion into a file, restarting the whole request
+        when it fails part way through.
+
+        Args:
+            messages (list): List of messages for the API.
+            response_format (dict): Format specification for the response.
+            path (str): File to write, truncated on every attempt.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for content in self.client.stream_chat_completion(
+                messages=messages,
+                response_format=response_format
+            ):
+                f.write(content)
+
     def _substitute_variables_in_files(self, folder, generated_files):
         """
         Substitutes placeholders in generated files with corresponding values.
@@ -205,17 +353,24 @@ class PromptProcessor:
             folder (str): Folder containing the files.
             generated_files (list): List of generated file paths.
         """
-        for file_path in generated_files:
-            content = load_file_content(file_path)
-            updated = False
-
-            # Find and replace variables like {{variable}}
-            for variable in re.findall(r'{{(.*?)}}', content):
-                replacement = load_variable_content(variable,folder)
-                if replacement:
-                    content = content.replace(f"{{{{{variable}}}}}", replacement)
-                    updated = True
-
-            if updated:
-                save_file_content(file_path, content)
+        contents = {file_path: load_file_content(file_path) for file_path in generated_files}
+
+        # Load every referenced variable once for the whole folder
+        needed = set()
+        for content in contents.values():
+            needed.update(_VAR_RE.findall(content))
+        if not needed:
+            return
+        values = load_variables_content(needed, folder)
+
+        def replace_variable(match):
+            # Keep the placeholder untouched when there is nothing to substitute
+            return values[match.group(1)] or match.group(0)
+
+        for file_path, content in contents.items():
+            # Replace variables like {{variable}} in a single pass
+            new_content = _VAR_RE.sub(replace_variable, content)
+
+            if new_content != content:
+                save_file_content(file_path, new_content)
                 logger.info(f"Updated variables in: {file_path}")
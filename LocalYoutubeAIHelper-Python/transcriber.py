@@ -1,17 +1,61 @@
 import os
+import bisect
 import concurrent.futures
 import datetime
+import functools
+import hashlib
+import heapq
+import itertools
+import operator
 import srt
-import json
 import subprocess
 import tiktoken
 import math
 from ai_client import AIClient
-from utilities import setup_logging, ensure_directory_exists, load_file_content, save_file_content
+from utilities import setup_logging, ensure_directory_exists, load_file_content, save_file_content, dump_json, load_json, DiskCache, file_cache_key
 from config import CONFIG
 
 logger = setup_logging()
 
+# ffprobe results keyed by file path, modification time and size
+_duration_cache = DiskCache('audio_duration.cache')
+_stream_cache = DiskCache('audio_stream.cache')
+# Improved SRT chunks keyed by a hash of prompt, chunk content and model
+_improve_cache = DiskCache('improve_srt.cache')
+
+def _json_default(obj):
+    """
+    Converts OpenAI response models into plain data for JSON serialization.
+
+    Args:
+        obj: Object the JSON encoder does not support natively.
+
+    Returns:
+        dict: Serializable representation of the object.
+    """
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# Sort key of word rows, the same (start, end) order srt.compose uses
+_start_end = operator.itemgetter(0, 1)
+
+def _parse_bitrate(bitrate):
+    """
+    Converts an ffmpeg bitrate string such as '12k' into bits per second.
+
+    Args:
+        bitrate (str): Bitrate with an optional k/M suffix.
+
+    Returns:
+        int: Bitrate in bits per second.
+    """
+    bitrate = str(bitrate).strip()
+    multipliers = {'k': 1000, 'K': 1000, 'm': 1000000, 'M': 1000000}
+    if bitrate and bitrate[-1] in multipliers:
+        return int(float(bitrate[:-1]) * multipliers[bitrate[-1]])
+    return int(float(bitrate))
+
 class Transcriber:
     def __init__(self, config, whisper_config):
         """
@@ -24,8 +68,29 @@ class Transcriber:
         self.config = config
         self.whisper_config = whisper_config
         self.whisper_config['timestamp_granularities'] = ['word', 'segment']  # Ensure both word and segment levels
+        # Upper bound for Whisper requests in flight at the same time
+        self.whisper_concurrency = int(self.whisper_config.get('whisper_concurrency') or 8)
+        # Upper bound for SRT improvement requests in flight at the same time
+        self.improve_concurrency = int(self.whisper_config.get('improve_concurrency') or 8)
+
+        max_tokens = self.config.get('max_tokens', 4096)
+        try:
+            self.max_tokens = int(max_tokens)
+        except (TypeError, ValueError):
+            logger.error(f"Invalid 'max_tokens' value in configuration: {max_tokens}. Using default value of 4096.")
+            self.max_tokens = 4096
+        self._safe_token_limit = math.floor(self.max_tokens * 0.75)
+        # Ask the model again instead of reusing improvements from previous runs
+        self.use_cache = str(self.config.get('no_cache', False)).lower() != 'true'
         self.client = AIClient(self.config,self.whisper_config)
 
+    @functools.cached_property
+    def _tokenizer(self):
+        """
+        tiktoken encoding for the default model, loaded on first use and then reused.
+        """
+        return tiktoken.encoding_for_model(self.config['default_model'])
+
     def transcribe_audio_files(self, audio_files):
         """
         Transcribes a list of audio files using OpenAI's Whisper API.
@@ -35,18 +100,36 @@ class Transcriber:
         """
         for audio_file in audio_files:
             logger.info(f"Transcribing audio file: {audio_file}")
-            chunks = self.split_audio_file(audio_file)
             output_dir = os.path.dirname(audio_file)
-            transcripts = {'segments': [], 'words': [], 'raw_responses': [] }
-
-            # Transcribe chunks in parallel
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = [executor.submit(self.transcribe_chunk, chunk) for chunk in chunks]
+            # One result slot per chunk, keyed by its start time, filled in whatever order uploads finish
+            chunk_results = {}
+
+            # Transcribe chunks in parallel, bounded by the configured concurrency.
+            # Chunks are submitted as soon as ffmpeg produces them, so uploads overlap with splitting.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.whisper_concurrency) as executor:
+                futures = [executor.submit(self.transcribe_chunk, chunk) for chunk in self.split_audio_file(audio_file)]
+                if not futures:
+                    logger.warning(f"No audio chunks to transcribe for: {audio_file}")
+                    continue
+
+                # Workers only upload; responses are parsed here, one at a time, as they arrive
                 for future in concurrent.futures.as_completed(futures):
-                    chunk_result = future.result()
-                    transcripts['segments'].extend(chunk_result['segments'])
-                    transcripts['words'].extend(chunk_result['words'])
-                    transcripts['raw_responses'].extend(chunk_result['response'])
+                    response, start_time = future.result()
+                    if response is None:
+                        continue
+                    chunk_result = self.process_whisper_response(response, start_time)
+                    chunk_result['response'] = response
+                    chunk_results[start_time] = chunk_result
+
+            # Keep each chunk's already ordered lists apart, in chunk order; they are merged
+            # when saving since neighbouring chunks overlap
+            ordered = [chunk_results[start_time] for start_time in sorted(chunk_results)]
+            transcripts = {
+                'segments': [result['segments'] for result in ordered],
+                'words': [result['words'] for result in ordered],
+                # One entry per chunk response, serialized with model_dump() when saved
+                'raw_responses': [result['response'] for result in ordered],
+            }
 
             # Combine transcripts and save results
             self.save_transcripts(output_dir, transcripts)
@@ -59,11 +142,14 @@ class Transcriber:
             folder (str): Path to the folder containing audio files.
         """
         logger.info(f"Transcribing folder: {folder}")
-        audio_files = [
-            os.path.join(folder, file)
-            for file in os.listdir(folder)
-            if file.endswith('.ogg') or file.endswith('.mp3')
-        ]
+        with os.scandir(folder) as entries:
+            audio_entries = [
+                entry for entry in entries
+                if entry.name.endswith(('.ogg', '.mp3')) and entry.is_file()
+            ]
+        # Longest files first, so the biggest job is not left for the end
+        audio_entries.sort(key=lambda entry: entry.stat().st_size, reverse=True)
+        audio_files = [entry.path for entry in audio_entries]
         if not audio_files:
             logger.warning(f"No audio files found in folder: {folder}")
             return
@@ -104,46 +190,42 @@ class Transcriber:
             chunks.append(chunk)
         return chunks
     
-    def split_srt_file_by_tokens(self, srt_content, max_tokens, token_safety_percentage=0.75):
+    def split_srt_file_by_tokens(self, srt_content, max_tokens=None, token_safety_percentage=0.75):
         """
         Splits SRT content into chunks based on token limit.
         
         Args:
             srt_content (str): Content of the SRT file.
-            max_tokens (int): Maximum tokens allowed per request.
+            max_tokens (int): Maximum tokens allowed per request, defaults to the configured 'max_tokens'.
             token_safety_percentage (float): Safety margin to prevent exceeding token limit.
         
         Returns:
             List[List[srt.Subtitle]]: List of subtitle chunks.
         """
         subtitles = list(srt.parse(srt_content))
-        tokenizer = tiktoken.encoding_for_model(self.config['default_model'])
-        safe_token_limit = math.floor(max_tokens * token_safety_percentage)
+        if max_tokens is None and token_safety_percentage == 0.75:
+            safe_token_limit = self._safe_token_limit
+        else:
+            safe_token_limit = math.floor((max_tokens or self.max_tokens) * token_safety_percentage)
 
-        chunks = []
-        current_chunk = []
-        current_tokens = 0
+        # Tokenize every SRT block in a single batch call
+        blocks = [subtitle.to_srt() for subtitle in subtitles]
+        token_counts = [len(ids) for ids in self._tokenizer.encode_ordinary_batch(blocks)]
+        cumulative_tokens = list(itertools.accumulate(token_counts))
 
-        for subtitle in subtitles:
-            raw_srt_block = srt.compose([subtitle])
-            # Calculate the number of tokens for the raw SRT block
-            subtitle_tokens = len(tokenizer.encode(raw_srt_block))
-            
-            # If adding this subtitle exceeds the safe token limit, finalize the current chunk
-            if current_tokens + subtitle_tokens > safe_token_limit:
-                chunks.append(current_chunk)
-                current_chunk = [subtitle]
-                current_tokens = subtitle_tokens
-            else:
-                current_chunk.append(subtitle)
-                current_tokens += subtitle_tokens
-
-        # Append any remaining subtitles
-        if current_chunk:
-            chunks.append(current_chunk)
+        chunks = []
+        start = 0
+        consumed_tokens = 0
+        while start < len(subtitles):
+            # Greedily take as many subtitles as fit under the limit, but always at least one
+            end = bisect.bisect_right(cumulative_tokens, consumed_tokens + safe_token_limit, lo=start)
+            end = max(end, start + 1)
+            chunks.append(subtitles[start:end])
+            consumed_tokens = cumulative_tokens[end - 1]
+            start = end
 
         return chunks
-      
+
     def improve_transcription_file(self, srt_files):
         """
         Improves transcription of SRT files by correcting grammatical errors and punctuation.
@@ -164,44 +246,28 @@ class Transcriber:
                 logger.error("We don't have 'improve_srt_content' in whisper_config.txt to process")
                 return
             
-            max_tokens = self.config.get('max_tokens', 4096)
-            try:
-                max_tokens = int(max_tokens)
-            except ValueError:
-                logger.error(f"Invalid 'max_tokens' value in configuration: {self.config.get('max_tokens')}. Using default value of 4096.")
-                max_tokens = 4096
-
             # Split the SRT content into manageable chunks
             #subtitle_chunks = self.split_srt_file(original_srt_content)
-            subtitle_chunks = self.split_srt_file_by_tokens(original_srt_content, max_tokens)
+            subtitle_chunks = self.split_srt_file_by_tokens(original_srt_content)
             logger.info(f"Divided SRT file into {len(subtitle_chunks)} token-safe chunks.")
             corrected_subtitles = []
-            
-            for chunk_index, chunk_subtitles in enumerate(subtitle_chunks):
-                logger.info(f"Sending chunk {chunk_index+1}/{len(subtitle_chunks)} for improvement")
-                chunk_srt_content = srt.compose(chunk_subtitles)
-                
-                messages = [
-                    {"role": "system", "content": prompt_content},
-                    {"role": "user", "content": chunk_srt_content},
-                ]
 
-                response = self.client.create_chat_completion(
-                    messages=messages
-                    ) 
-                
-                assistant_content = response.choices[0].message.content
-
-                # Parse the corrected chunk and add to the list
-                corrected_chunk_subtitles = list(srt.parse(assistant_content))
-                corrected_subtitles.extend(corrected_chunk_subtitles)
+            # Improve chunks concurrently, collecting the results in chunk order
+            max_workers = max(1, min(len(subtitle_chunks), self.improve_concurrency))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self.improve_chunk, prompt_content, chunk_index, len(subtitle_chunks), chunk_subtitles)
+                    for chunk_index, chunk_subtitles in enumerate(subtitle_chunks)
+                ]
+                for future in futures:
+                    corrected_subtitles.extend(future.result())
 
             # Re-index subtitles
             for i, subtitle in enumerate(corrected_subtitles, 1):
                 subtitle.index = i
 
             # Compose the full corrected SRT content
-            corrected_srt_content = srt.compose(corrected_subtitles)
+            corrected_srt_content = self.compose_srt(corrected_subtitles)
             
             # Define file paths
             transcript_srt = os.path.join(output_dir, 'transcript.srt')
@@ -230,6 +296,52 @@ class Transcriber:
                 f.write(llmsrt_content)
             logger.info(f"Saved LLM-friendly transcript to: {transcript_llmsrt}")
 
+    def improve_chunk(self, prompt_content, chunk_index, chunk_count, chunk_subtitles):
+        """
+        Sends a single SRT chunk to the LLM for improvement.
+
+        Args:
+            prompt_content (str): System prompt describing the improvement.
+            chunk_index (int): Index of the chunk, used for logging.
+            chunk_count (int): Total number of chunks, used for logging.
+            chunk_subtitles (list): List of srt.Subtitle objects in the chunk.
+
+        Returns:
+            list: Corrected srt.Subtitle objects.
+        """
+        logger.info(f"Sending chunk {chunk_index+1}/{chunk_count} for improvement")
+        chunk_srt_content = self.compose_srt(chunk_subtitles)
+
+        messages = [
+            {"role": "system", "content": prompt_content},
+            {"role": "user", "content": chunk_srt_content},
+        ]
+
+        # Identical prompt, chunk and model always get the answer from the previous run
+        model = self.config['default_model']
+        cache_key = hashlib.blake2b(
+            b'|'.join(part.encode('utf-8') for part in (prompt_content, chunk_srt_content, model)),
+            digest_size=16
+        ).hexdigest()
+        cached_content = _improve_cache.get(cache_key) if self.use_cache else None
+        if cached_content is not None:
+            try:
+                corrected = list(srt.parse(cached_content))
+                logger.info(f"Using cached improvement for chunk {chunk_index+1}/{chunk_count}")
+                return corrected
+            except srt.SRTParseError:
+                logger.warning(f"Ignoring unparsable cached improvement for chunk {chunk_index+1}/{chunk_count}")
+
+        response = self.client.create_chat_completion(
+            messages=messages
+            )
+
+        assistant_content = response.choices[0].message.content
+        # Parse the corrected chunk, only replies that parse are cached
+        corrected = list(srt.parse(assistant_content))
+        _improve_cache.set(cache_key, assistant_content)
+        return corrected
+
     def backup_file(self, original_path, backup_filename):
         """
         Creates a backup of the original file if it exists.
@@ -251,7 +363,7 @@ class Transcriber:
             chunk (dict): Information about the audio chunk.
 
         Returns:
-            dict: Dictionary containing segment-level and word-level transcripts.
+            tuple: Raw Whisper response (None on failure) and the chunk start time in milliseconds.
         """
         try:   
             response = None         
@@ -259,20 +371,21 @@ class Transcriber:
             # Filter the whisper_config dictionary to include only valid parameters
             filtered_whisper_config = {k: v for k, v in self.whisper_config.items() if k in valid_params}
             
+            # The SDK streams the open file in small reads, so chunks are never held in memory whole
             with open(chunk['file_path'], 'rb') as audio_file:
                 logger.info(f"Sending chunk to Whisper API: {chunk['file_path']}")
                 response = self.client.transcribe_audio(
                     audio_file=audio_file,
                     **filtered_whisper_config
                 )
-                result = self.process_whisper_response(response, chunk['start_time'])
-                if chunk['is_temp']:
-                    os.remove(chunk['file_path'])  # Cleanup temporary chunk
-                result['response']=response
-                return result
+                return response, chunk['start_time']
         except Exception as e:
             logger.error(f"Error transcribing chunk: {e}")
-            return {'segments': [], 'words': [], 'response': response}
+            return response, chunk['start_time']
+        finally:
+            # Cleanup temporary chunk once its file is closed, whether or not the upload succeeded
+            if chunk['is_temp'] and os.path.exists(chunk['file_path']):
+                os.remove(chunk['file_path'])
 
     def process_whisper_response(self, response, start_time_ms):
         """
@@ -285,33 +398,141 @@ class Transcriber:
         Returns:
             dict: Dictionary containing segment-level and word-level transcripts.
         """
-        MIN_DURATION = datetime.timedelta(milliseconds=10)  # 0.01 seconds
         try:
-            start_delta = datetime.timedelta(milliseconds=start_time_ms)
-            segments = []
-            words = []
-
-            # Process segments
-            for i, segment in enumerate(response.segments):
-                start = datetime.timedelta(seconds=segment['start']) + start_delta
-                end = datetime.timedelta(seconds=segment['end']) + start_delta
-                if start >= end:
-                    end = start + MIN_DURATION
-                segments.append(srt.Subtitle(index=i + 1, start=start, end=end, content=segment.get('text', '').strip()))
-
-            # Process words
-            for i, word in enumerate(response.words):
-                start = datetime.timedelta(seconds=word['start']) + start_delta
-                end = datetime.timedelta(seconds=word['end']) + start_delta
-                if start >= end:
-                    end = start + MIN_DURATION                
-                words.append(srt.Subtitle(index=i + 1, start=start, end=end, content=word.get('word', '').strip()))
+            offset = start_time_ms / 1000
+            segments = self._build_subtitles(response.segments, 'text', offset)
+            words = self._build_word_rows(response.words, start_time_ms)
 
             return {'segments': segments, 'words': words}
         except Exception as e:
             logger.error(f"Error processing Whisper response: {e}")
             return {'segments': [], 'words': []}
 
+    @staticmethod
+    def _build_subtitles(items, text_key, offset):
+        """
+        Builds subtitles from Whisper segments or words. Times are shifted by the
+        chunk offset as plain floats, so only the final timedeltas are allocated.
+
+        Args:
+            items (list): Whisper segments or words with 'start' and 'end' in seconds.
+            text_key (str): Key holding the text of an item.
+            offset (float): Start time of the chunk in seconds.
+
+        Returns:
+            list: List of srt.Subtitle objects.
+        """
+        MIN_DURATION = 0.01  # seconds
+        timedelta = datetime.timedelta
+        subtitles = []
+        for i, item in enumerate(items, 1):
+            start = item['start'] + offset
+            end = item['end'] + offset
+            if start >= end:
+                end = start + MIN_DURATION
+            subtitles.append(srt.Subtitle(
+                index=i,
+                start=timedelta(seconds=start),
+                end=timedelta(seconds=end),
+                content=item.get(text_key, '').strip()
+            ))
+        # Chunks are merged by start time, so each one must already be in that order
+        subtitles.sort(key=operator.attrgetter('start'))
+        return subtitles
+
+    @staticmethod
+    def _build_word_rows(items, start_time_ms):
+        """
+        Builds word-level rows as plain (start_us, end_us, text) tuples, sorted
+        like srt.compose sorts subtitles. Word transcripts are only ever written
+        out, so they skip srt.Subtitle objects entirely.
+
+        Args:
+            items (list): Whisper words with 'start' and 'end' in seconds.
+            start_time_ms (int): Start time of the chunk in milliseconds.
+
+        Returns:
+            list: List of (start_us, end_us, text) tuples.
+        """
+        MIN_DURATION = datetime.timedelta(milliseconds=10)
+        microsecond = datetime.timedelta(microseconds=1)
+        timedelta = datetime.timedelta
+        offset = timedelta(milliseconds=start_time_ms)
+        rows = []
+        for item in items:
+            # Full precision times, the zero-length check must not see truncated milliseconds
+            start = timedelta(seconds=item['start']) + offset
+            end = timedelta(seconds=item['end']) + offset
+            if start >= end:
+                end = start + MIN_DURATION
+            rows.append((start // microsecond, end // microsecond, item.get('word', '').strip()))
+        # Zero-length words often share a start, ties are ordered by end like in srt.compose
+        rows.sort(key=_start_end)
+        return rows
+
+    @staticmethod
+    def _format_srt_timestamp(ms):
+        """
+        Formats milliseconds as an SRT timestamp (HH:MM:SS,mmm).
+
+        Args:
+            ms (int): Time in milliseconds.
+
+        Returns:
+            str: SRT timestamp.
+        """
+        hours, ms = divmod(ms, 3600000)
+        minutes, ms = divmod(ms, 60000)
+        seconds, ms = divmod(ms, 1000)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+    def compose_srt(self, subtitles):
+        """
+        Writes subtitles as SRT content without the per-subtitle copies and
+        checks done by srt.compose. Subtitles out of srt.compose order (start, end,
+        index), or content srt.compose would have to rewrite (blank lines inside
+        a subtitle), fall back to the library.
+
+        Args:
+            subtitles (list): srt.Subtitle objects, normally already in time order.
+
+        Returns:
+            str: SRT content.
+        """
+        if any(subtitle.content.startswith('\n') or '\n\n' in subtitle.content for subtitle in subtitles) or \
+                any(b < a for a, b in itertools.pairwise(subtitles)):
+            return srt.compose(subtitles)
+
+        millisecond = datetime.timedelta(milliseconds=1)
+        fmt = self._format_srt_timestamp
+        # Like srt.compose, skip blank or invalid subtitles and number the rest from 1
+        valid = (
+            subtitle for subtitle in subtitles
+            if subtitle.content.strip() and datetime.timedelta(0) <= subtitle.start < subtitle.end
+        )
+        return "".join(
+            f"{i}\n{fmt(subtitle.start // millisecond)} --> {fmt(subtitle.end // millisecond)}"
+            f"{' ' + subtitle.proprietary if subtitle.proprietary else ''}\n{subtitle.content}\n\n"
+            for i, subtitle in enumerate(valid, 1)
+        )
+
+    def compose_word_srt(self, words):
+        """
+        Writes word rows as SRT content, matching srt.compose output for single-line content.
+
+        Args:
+            words (list): (start_us, end_us, text) tuples ordered by start and end.
+
+        Returns:
+            str: SRT content.
+        """
+        fmt = self._format_srt_timestamp
+        # Like srt.compose, drop empty words, number the remaining ones from 1 and truncate to milliseconds
+        return "".join(
+            f"{i}\n{fmt(start_us // 1000)} --> {fmt(end_us // 1000)}\n{text}\n\n"
+            for i, (start_us, end_us, text) in enumerate((word for word in words if word[2]), 1)
+        )
+
     def split_audio_file(self, file_path, chunk_length_ms=4 * 60 * 60 * 1000, overlap_ms=10000):
         """
         Splits an audio file into chunks for transcription.
@@ -321,29 +542,41 @@ class Transcriber:
             chunk_length_ms (int): Length of each chunk in milliseconds.
             overlap_ms (int): Overlap between chunks in milliseconds.
 
-        Returns:
-            list: List of dictionaries containing chunk information.
+        Yields:
+            dict: Chunk information, as soon as each chunk is ready for transcription.
         """
         file_size = os.path.getsize(file_path)
         if file_size <= 24.8 * 1024 * 1024:
-            return [{'file_path': file_path, 'start_time': 0, 'is_temp': False}]
+            yield {'file_path': file_path, 'start_time': 0, 'is_temp': False}
+            return
 
         duration_ms = self.get_audio_duration(file_path)
         if duration_ms is None:
-            return []
+            return
 
-        logger.info(f"Splitting audio file '{file_path}' into chunks...")
-        chunks = []
+        ranges = []
         start = 0
         while start < duration_ms:
             end = min(start + chunk_length_ms, duration_ms)
             chunk_filename = f"{os.path.splitext(file_path)[0]}_part{start // 1000}-{end // 1000}.ogg"
-            self.split_audio_ffmpeg(file_path, start, end, chunk_filename)
-            chunks.append({'file_path': chunk_filename, 'start_time': start, 'is_temp': True})
+            ranges.append((start, end, chunk_filename))
             start += chunk_length_ms - overlap_ms
-        return chunks
 
-    def split_audio_ffmpeg(self, input_file, start_time, end_time, output_file):
+        logger.info(f"Splitting audio file '{file_path}' into {len(ranges)} chunks...")
+        stream_copy = self._can_stream_copy(file_path)
+        # Each ffmpeg encode is mostly single-threaded, so run several of them side by side
+        max_workers = max(1, (os.cpu_count() or 2) // 2)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.split_audio_ffmpeg, file_path, start, end, chunk_filename, stream_copy): (start, chunk_filename)
+                for start, end, chunk_filename in ranges
+            }
+            for future in concurrent.futures.as_completed(futures):
+                start, chunk_filename = futures[future]
+                if future.result():
+                    yield {'file_path': chunk_filename, 'start_time': start, 'is_temp': True}
+
+    def split_audio_ffmpeg(self, input_file, start_time, end_time, output_file, stream_copy=False):
         """
         Splits an audio file into a specific segment using ffmpeg.
 
@@ -352,19 +585,77 @@ class Transcriber:
             start_time (int): Start time of the segment in milliseconds.
             end_time (int): End time of the segment in milliseconds.
             output_file (str): Path to the output file.
+            stream_copy (bool): Copy the Opus packets instead of re-encoding them.
+
+        Returns:
+            bool: True if the segment was created successfully.
         """
         start_time_str = str(datetime.timedelta(milliseconds=start_time))
         duration_str = str(datetime.timedelta(milliseconds=end_time - start_time))
-        command = [
-            'ffmpeg', '-y', '-i', input_file,
-            '-ss', start_time_str, '-t', duration_str,
-            '-ac', '1', '-c:a', 'libopus', '-b:a', self.config['audio_bitrate'], '-application', 'voip', output_file
-        ]
+        if stream_copy:
+            # Input seeking is fast and packet accurate, which is all a copy needs
+            command = [
+                'ffmpeg', '-nostdin', '-loglevel', 'error', '-y', '-ss', start_time_str, '-i', input_file,
+                '-t', duration_str, '-c', 'copy', output_file
+            ]
+        else:
+            command = [
+                'ffmpeg', '-nostdin', '-loglevel', 'error', '-y', '-i', input_file,
+                '-ss', start_time_str, '-t', duration_str, '-threads', '0',
+                '-ac', '1', '-c:a', 'libopus', '-b:a', self.config['audio_bitrate'], '-application', 'voip', output_file
+            ]
         try:
-            subprocess.run(command, check=True)
+            # Several ffmpeg processes run at once, so keep them off the terminal
+            # and only collect their errors
+            subprocess.run(
+                command, check=True,
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+            )
             logger.info(f"Created chunk: {output_file}")
+            return True
         except subprocess.CalledProcessError as e:
-            logger.error(f"Error splitting audio with ffmpeg: {e}")
+            stderr = e.stderr.decode(errors='replace').strip() if e.stderr else ''
+            logger.error(f"Error splitting audio with ffmpeg: {e} {stderr}")
+            return False
+
+    def _can_stream_copy(self, file_path):
+        """
+        Checks whether an audio file is already mono Opus at the configured bitrate,
+        in which case chunks can be cut without re-encoding.
+
+        Args:
+            file_path (str): Path to the audio file.
+
+        Returns:
+            bool: True if the audio stream can be copied as is.
+        """
+        try:
+            cache_key = file_cache_key(file_path)
+            stream = _stream_cache.get(cache_key)
+            if stream is None:
+                command = [
+                    'ffprobe', '-v', 'error', '-select_streams', 'a:0',
+                    '-show_entries', 'stream=codec_name,channels:format=bit_rate',
+                    '-of', 'json', file_path
+                ]
+                result = subprocess.run(command, capture_output=True, check=True)
+                probe = load_json(result.stdout)
+                streams = probe.get('streams') or [{}]
+                stream = {
+                    'codec_name': streams[0].get('codec_name'),
+                    'channels': streams[0].get('channels'),
+                    'bit_rate': probe.get('format', {}).get('bit_rate'),
+                }
+                _stream_cache.set(cache_key, stream)
+
+            if stream['codec_name'] != 'opus' or stream['channels'] != 1 or not stream['bit_rate']:
+                return False
+            # Opus is VBR, so the container average only roughly matches the target bitrate
+            target = _parse_bitrate(self.config['audio_bitrate'])
+            return abs(int(stream['bit_rate']) - target) <= target * 0.25
+        except Exception as e:
+            logger.warning(f"Could not probe audio stream, re-encoding chunks: {e}")
+            return False
 
     def get_audio_duration(self, file_path):
         """
@@ -377,12 +668,20 @@ class Transcriber:
             float: Duration in milliseconds.
         """
         try:
+            cache_key = file_cache_key(file_path)
+            duration_ms = _duration_cache.get(cache_key)
+            if duration_ms is not None:
+                return duration_ms
+
             command = [
                 'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1', file_path
+                '-of', 'json=c=1', file_path
             ]
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
-            return float(result.stdout.strip()) * 1000  # Convert seconds to milliseconds
+            # Raw bytes go straight to the JSON parser, no locale-dependent text decoding
+            result = subprocess.run(command, capture_output=True, check=True)
+            duration_ms = float(load_json(result.stdout)['format']['duration']) * 1000  # Convert seconds to milliseconds
+            _duration_cache.set(cache_key, duration_ms)
+            return duration_ms
         except Exception as e:
             logger.error(f"Error retrieving audio duration: {e}")
             return None
@@ -393,25 +692,22 @@ class Transcriber:
 
         Args:
             output_dir (str): Directory to save the transcript files.
-            transcripts (dict): Dictionary containing segment-level and word-level transcripts.
+            transcripts (dict): Dictionary containing per-chunk lists of segment-level and word-level transcripts.
         """
         # Ensure output directory exists
         ensure_directory_exists(output_dir)
 
-        # Segment-level transcripts
-        segments = transcripts['segments']
-        segments.sort(key=lambda x: x.start)
+        # Segment-level transcripts, merged from the per-chunk lists
+        by_start = operator.attrgetter('start')
+        segments = list(heapq.merge(*transcripts['segments'], key=by_start))
         for i, segment in enumerate(segments, 1):
             segment.index = i
-        srt_content = srt.compose(segments)
+        srt_content = self.compose_srt(segments)
         text_content = " ".join(segment.content for segment in segments)
 
-        # Word-level transcripts
-        words = transcripts['words']
-        words.sort(key=lambda x: x.start)
-        for i, word in enumerate(words, 1):
-            word.index = i
-        word_srt_content = srt.compose(words)
+        # Word-level transcripts, every chunk is already sorted by start and end
+        words = heapq.merge(*transcripts['words'], key=_start_end)
+        word_srt_content = self.compose_word_srt(words)
 
         # Generate LLM-friendly SRT content
         llmsrt_content = self.convert_to_llmsrt(segments)
@@ -419,8 +715,7 @@ class Transcriber:
         # Save raw responses as JSON
         raw_responses = transcripts['raw_responses']
         raw_responses_path = os.path.join(output_dir, 'raw_responses.json')
-        with open(raw_responses_path, 'w', encoding='utf-8') as f:
-            json.dump(raw_responses, f, indent=4)
+        dump_json(raw_responses, raw_responses_path, default=_json_default)
 
         # Save files
         save_file_content(os.path.join(output_dir, 'transcript.srt'), srt_content)
@@ -440,8 +735,9 @@ class Transcriber:
         Returns:
             str: Simplified transcript content.
         """
-        formatted_lines = []
-        for subtitle in subtitles:
-            timestamp = str(subtitle.start).split('.')[0]  # Keep only HH:MM:SS
-            formatted_lines.append(f"[{timestamp}] {subtitle.content}")
-        return "\n".join(formatted_lines)
+        def format_line(subtitle):
+            # Same H:MM:SS as str(timedelta) without the fractional part, using integer math
+            seconds = int(subtitle.start.total_seconds())
+            return f"[{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}] {subtitle.content}"
+
+        return "\n".join(format_line(subtitle) for subtitle in subtitles)
@@ -1,6 +1,25 @@
 import re
+import bisect
+import functools
+import itertools
+import json
 import logging
+import mmap
 import os
+import shelve
+import threading
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, fall back to the standard library
+    orjson = None
+
+_YOUTUBE_URL_RE = re.compile(r'^(https?://)?(www\.)?(youtube\.com|youtu\.be)/.+$')
+# Anything that is not alphanumeric, '_', ' ', '.' or '-' (\w is str.isalnum() plus '_')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w .\-]')
+# The same rule as a deletion table for pure ASCII names
+_UNSAFE_ASCII_BYTES = bytes(b for b in range(128) if not (chr(b).isalnum() or chr(b) in ' ._-'))
 
 def setup_logging(log_level='INFO'):
     """
@@ -30,7 +49,10 @@ def sanitize_filename(filename):
     Returns:
         str: Sanitized filename.
     """
-    return "".join(c for c in filename if c.isalnum() or c in (' ', '.', '_', '-')).strip()
+    if filename.isascii():
+        # Common case: a single bytes.translate call deletes every unsafe character
+        return filename.encode('ascii').translate(None, _UNSAFE_ASCII_BYTES).decode('ascii').strip()
+    return _UNSAFE_FILENAME_CHARS_RE.sub('', filename).strip()
 
 def is_youtube_url(url):
     """
@@ -42,10 +64,7 @@ def is_youtube_url(url):
     Returns:
         bool: True if the URL is a YouTube URL, False otherwise.
     """
-    youtube_url_pattern = re.compile(
-        r'^(https?://)?(www\.)?(youtube\.com|youtu\.be)/.+$'
-    )
-    return bool(youtube_url_pattern.match(url))
+    return _YOUTUBE_URL_RE.match(url) is not None
 
 def ensure_directory_exists(path):
     """
@@ -57,8 +76,7 @@ def ensure_directory_exists(path):
     Returns:
         str: The directory path (unchanged).
     """
-    if not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
+    os.makedirs(path, exist_ok=True)
     return path
 
 def limit_tags_to_500_chars(tags_string):
@@ -73,20 +91,11 @@ def limit_tags_to_500_chars(tags_string):
         str: A trimmed string of tags not exceeding 500 characters.
     """
     tags_list = [tag.strip() for tag in tags_string.split(',')]
-    result_tags = []
-    current_length = 0
-
-    for tag in tags_list:
-        tag_length = len(tag) + (1 if result_tags else 0)  # Include comma for subsequent tags
-        if ' ' in tag:
-            tag_length += 2  # Account for quotes if spaces exist in a tag
-
-        if current_length + tag_length > 500:
-            break
-        result_tags.append(tag)
-        current_length += tag_length
-
-    return ','.join(result_tags)
+    # Width of each tag: its length, quotes if it contains spaces, and a comma for all but the first
+    widths = [len(tag) + (2 if ' ' in tag else 0) + (1 if i else 0) for i, tag in enumerate(tags_list)]
+    # Keep the longest prefix of tags whose running width stays within the limit
+    cutoff = bisect.bisect_right(list(itertools.accumulate(widths)), 500)
+    return ','.join(tags_list[:cutoff])
 
 def format_duration(seconds):
     """
@@ -98,9 +107,9 @@ def format_duration(seconds):
     Returns:
         str: Formatted duration string.
     """
-    hours, remainder = divmod(seconds, 3600)
+    hours, remainder = divmod(int(seconds), 3600)
     minutes, seconds = divmod(remainder, 60)
-    return f"{hours:02}:{minutes:02}:{seconds:02}"
+    return "%02d:%02d:%02d" % (hours, minutes, seconds)
 
 def load_file_content(filepath, default_content=""):
     """
@@ -113,52 +122,216 @@ def load_file_content(filepath, default_content=""):
     Returns:
         str: File content or default content.
     """
-    if os.path.exists(filepath):
-        with open(filepath, 'r', encoding='utf-8') as file:
-            return file.read()
-    return default_content
+    try:
+        return Path(filepath).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return default_content
+
+def mmap_file_content(filepath):
+    """
+    Loads a UTF-8 text file through a read-only memory map, decoding straight
+    from the mapped pages instead of copying them into an intermediate buffer.
+
+    Args:
+        filepath (str): Path to the file.
+
+    Returns:
+        str: File content.
+    """
+    with open(filepath, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ""  # Empty files cannot be mapped
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            return str(mapped, 'utf-8')
+
+def prefetch_file(filepath):
+    """
+    Asks the OS to start reading a file into the page cache ahead of its use.
+    Does nothing on platforms without posix_fadvise.
+
+    Args:
+        filepath (str): Path to the file.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logging.getLogger(__name__).debug(f"Could not prefetch '{filepath}': {e}")
 
 def load_variable_content(variable_name, folder):
     """
-    Load the content of the file with the largest number in '{{variable}}.prompt.{{number}}.txt'.
+    Load the content of the file with the largest number in '{{variable}}.{{number}}.prompt.txt'.
     Treat '{{variable}}.prompt.txt' as having number 0.
+    Results are cached until the selected file changes.
+    """
+    return load_variables_content((variable_name,), folder)[variable_name]
+
+def _read_text_cached(filepath):
+    """
+    Reads a UTF-8 file, reusing the previous content while its modification time and size are unchanged.
+    """
+    stat = os.stat(filepath)
+    return _read_text_versioned(filepath, stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=1024)
+def _read_text_versioned(filepath, mtime_ns, size):
+    return Path(filepath).read_text(encoding='utf-8')
+
+def load_variables_content(variable_names, folder):
+    """
+    Loads several variables with a single directory scan. Each variable is read
+    from the file with the largest number in '{{variable}}.{{number}}.prompt.txt',
+    '{{variable}}.prompt.txt' counts as number 0. Contents are cached until the
+    selected file changes.
+
+    Args:
+        variable_names (iterable): Names of the variables to load.
+        folder (str): Folder containing the variable files.
+
+    Returns:
+        dict: Variable name mapped to its content, or None when no file exists.
+    """
+    return {
+        name: _read_text_cached(path) if path else None
+        for name, path in find_latest_numbered_files(variable_names, folder).items()
+    }
+
+def find_latest_numbered_files(names, folder, suffix='.prompt.txt'):
     """
-    # Initialize variable files list, treating the default file without a number as number 0
-    variable_files = []
-    default_file = os.path.join(folder, f"{variable_name}.prompt.txt")
-    
-    if os.path.exists(default_file):
-        variable_files.append((default_file, 0))  # Treat as number 0
-
-    # Search for numbered files
-    pattern = re.compile(rf"{variable_name}\.(\d+)\.prompt\.txt$")
-    
-    for file_name in os.listdir(folder):
-        match = pattern.match(file_name)
-        if match:
-            file_number = int(match.group(1))
-            file_path = os.path.join(folder, file_name)
-            variable_files.append((file_path, file_number))
-
-    if not variable_files:
-        return None
-
-    # Select the file with the highest number
-    file_with_largest_number = max(variable_files, key=lambda x: x[1])[0]
-
-    #print(f"we choose {file_with_largest_number} from {variable_files}")
-    
-    with open(file_with_largest_number, 'r', encoding='utf-8') as file:
-        return file.read()
-    
+    Finds the file with the largest number in '{{name}}.{{number}}{{suffix}}' for
+    several names with a single directory scan. '{{name}}{{suffix}}' counts as number 0.
+
+    Args:
+        names (iterable): Base names to look for.
+        folder (str): Folder to scan.
+        suffix (str): File name suffix shared by the files.
+
+    Returns:
+        dict: Name mapped to the path of its latest file, or None when no file exists.
+    """
+    # {name: (number, path)}, the unnumbered default file counts as number 0
+    best = {name: (-1, None) for name in names}
+    if not best:
+        return {}
+
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.name.endswith(suffix):
+                continue
+            stem = entry.name[:-len(suffix)]
+            candidates = []
+            if stem in best:
+                candidates.append((stem, 0, True))
+            name, _, number = stem.rpartition('.')
+            if name in best and number.isdecimal():
+                candidates.append((name, int(number), False))
+            for name, number, is_default in candidates:
+                # On equal numbers the default file wins
+                if number > best[name][0] or (number == best[name][0] and is_default):
+                    best[name] = (number, entry.path)
+
+    return {name: path for name, (_, path) in best.items()}
 
 def save_file_content(filepath, content):
     """
-    Saves content to a file.
+    Saves content to a file. The content is written to a temporary file next to
+    it first and then moved into place, so readers never see a partial file.
 
     Args:
         filepath (str): Path to the file.
         content (str): Content to save.
     """
-    with open(filepath, 'w', encoding='utf-8') as file:
-        file.write(content)
+    temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8', buffering=1024 * 1024) as file:
+            file.write(content)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def load_json(content):
+    """
+    Parses JSON content, using orjson when it is installed.
+
+    Args:
+        content (str | bytes): JSON document.
+
+    Returns:
+        Parsed JSON data.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def dump_json(data, filepath, default=None):
+    """
+    Writes data to a file as indented JSON, using orjson when it is installed.
+
+    Args:
+        data: JSON-serializable data.
+        filepath (str): Path to the output file.
+        default (callable): Optional hook converting unsupported objects.
+    """
+    if orjson is not None:
+        with open(filepath, 'wb') as file:
+            file.write(orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2))
+    else:
+        # Same layout as orjson: 2-space indent and unescaped UTF-8
+        with open(filepath, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, ensure_ascii=False, default=default)
+
+class DiskCache:
+    """
+    Small persistent key/value store backed by shelve, kept under the user's
+    cache directory and safe to share between threads.
+    """
+    def __init__(self, name):
+        self.cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'youtube-ai-helper')
+        self.path = os.path.join(self.cache_dir, name)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for a key, or default when missing or unreadable.
+        """
+        with self._lock:
+            try:
+                with shelve.open(self.path, flag='r') as db:
+                    return db.get(key, default)
+            except Exception as e:
+                logging.getLogger(__name__).debug(f"Cache read failed for '{self.path}': {e}")
+                return default
+
+    def set(self, key, value):
+        """
+        Stores a value for a key. Failures are logged and otherwise ignored.
+        """
+        with self._lock:
+            try:
+                ensure_directory_exists(self.cache_dir)
+                with shelve.open(self.path) as db:
+                    db[key] = value
+            except Exception as e:
+                logging.getLogger(__name__).debug(f"Cache write failed for '{self.path}': {e}")
+
+def file_cache_key(filepath):
+    """
+    Builds a cache key that changes whenever the file is modified.
+
+    Args:
+        filepath (str): Path to the file.
+
+    Returns:
+        str: Key made of the absolute path, modification time and size.
+    """
+    stat = os.stat(filepath)
+    return f"{os.path.abspath(filepath)}|{stat.st_mtime_ns}|{stat.st_size}"
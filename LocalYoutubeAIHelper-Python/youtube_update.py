@@ -1,16 +1,145 @@
+import concurrent.futures
+import datetime
+import functools
+import hashlib
+import json
 import os
+import re
+import threading
+from pathlib import Path
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from utilities import load_file_content, setup_logging,\
-load_variable_content, limit_tags_to_500_chars
+from googleapiclient.http import HttpRequest, MediaFileUpload
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
+from utilities import load_file_content, save_file_content, setup_logging,\
+load_variables_content, limit_tags_to_500_chars
 from config import CONFIG, resolve_path
 
 logger = setup_logging()
 
+# First 'youtube_id=' line of file_details.txt, value ends at the line end or a further '='
+_YOUTUBE_ID_RE = re.compile(rb'^youtube_id=([^=\r\n]*)', re.MULTILINE)
+
+# Every snippet field videos().update accepts, so a fetched snippet can be written back unchanged
+SNIPPET_FIELDS = (
+    'items(id,snippet(title,description,tags,categoryId,defaultLanguage,defaultAudioLanguage))'
+)
+# Bytes of file_details.txt searched for the YouTube ID before reading the rest
+YOUTUBE_ID_READ_SIZE = 8192
+# videos().list accepts at most 50 IDs per call
+MAX_IDS_PER_REQUEST = 50
+# Google APIs accept at most 1000 calls in one batch request
+MAX_BATCH_SIZE = 1000
+# Subtitle upload chunk size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Retries for throttled (429, rate limit 403) and 5xx responses, with jittered exponential backoff
+API_RETRIES = 5
+
+# Refresh this long before the access token expires
+CREDENTIALS_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+
+def _expires_soon(creds):
+    """
+    Checks whether credentials expire within the refresh margin.
+
+    Args:
+        creds (Credentials): OAuth2 credentials.
+
+    Returns:
+        bool: True if the access token should be refreshed now.
+    """
+    if not creds.expiry:
+        return False
+    # google-auth stores the expiry as a naive UTC datetime
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return creds.expiry - now < CREDENTIALS_REFRESH_MARGIN
+
+@functools.lru_cache(maxsize=1024)
+def _read_youtube_id_versioned(file_path, mtime_ns, size):
+    """
+    Returns the YouTube ID from file_details.txt, or None if not found.
+    The modification time and size are part of the cache key, so edits invalidate the cached ID.
+    """
+    # Search the raw bytes, no text decoding or newline translation. The ID is
+    # normally near the top, so only the head is read unless the file is larger
+    with open(file_path, 'rb') as f:
+        data = f.read(YOUTUBE_ID_READ_SIZE)
+        match = _YOUTUBE_ID_RE.search(data)
+        if len(data) == YOUTUBE_ID_READ_SIZE and (match is None or match.end() == len(data)):
+            # Not found, or the value may continue past the head
+            data += f.read()
+            match = _YOUTUBE_ID_RE.search(data)
+    return match.group(1).decode('utf-8').strip() if match else None
+
+class _SharedCredentials(Credentials):
+    """
+    OAuth2 credentials shared by the connections of every thread. Only one thread
+    refreshes the access token at a time, the others wait and reuse the new token.
+    Tokens are refreshed shortly before they expire rather than after a failed
+    request, and every refresh is handed to on_refresh so it can be stored.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._refresh_lock = threading.Lock()
+        self.on_refresh = None
+
+    @classmethod
+    def from_credentials(cls, creds, scopes):
+        """
+        Copies loaded or freshly authorized credentials into shared credentials.
+
+        Args:
+            creds (Credentials): OAuth2 credentials.
+            scopes (list): Scopes of the credentials.
+
+        Returns:
+            _SharedCredentials: Shared copy of the credentials.
+        """
+        return cls.from_authorized_user_info(json.loads(creds.to_json()), scopes)
+
+    def before_request(self, request, method, url, headers):
+        if _expires_soon(self):
+            self.refresh(request)
+        super().before_request(request, method, url, headers)
+
+    def refresh(self, request):
+        token = self.token
+        with self._refresh_lock:
+            # Another thread already refreshed the token while this one was waiting
+            if self.token != token and self.valid:
+                return
+            logger.info("Refreshing YouTube access token...")
+            super().refresh(request)
+            if self.on_refresh is not None:
+                self.on_refresh(self)
+
+def _thread_local_request_builder(creds):
+    """
+    Returns a googleapiclient request builder that gives every thread its own
+    authorized connection, since httplib2.Http objects must not be shared between threads.
+
+    Args:
+        creds (Credentials): OAuth2 credentials for the connections.
+
+    Returns:
+        callable: Request builder for googleapiclient.discovery.build.
+    """
+    local = threading.local()
+
+    def build_request(http, *args, **kwargs):
+        if not hasattr(local, 'http'):
+            local.http = AuthorizedHttp(creds, http=httplib2.Http())
+        return HttpRequest(local.http, *args, **kwargs)
+
+    return build_request
+
 class YouTubeUpdater:
+    # Authenticated services keyed by token file, shared by every updater in the process
+    _service_cache = {}
+
     def __init__(self, config):
         """
         Initializes the YouTubeUpdater with configuration settings.
@@ -21,12 +150,22 @@ class YouTubeUpdater:
         self.token_file = resolve_path(config['token_file'])
         self.client_secret_file = config['client_secret_file']
         self.scopes = config['scopes']
-        self.service = self.authenticate_youtube()
+        # (video_id, request, snippet) entries waiting for flush_updates()
+        self._pending_updates = []
+        self._pending_lock = threading.Lock()
+        # Latest known details per video ID, filled by fetches and updates
+        self._details_cache = {}
+        self.service = self._service_cache.get(self.token_file)
+        if self.service is None:
+            self.service = self.authenticate_youtube()
+            YouTubeUpdater._service_cache[self.token_file] = self.service
 
     def authenticate_youtube(self):
         """
         Authenticates to the YouTube API using OAuth2.
         Handles token file existence, validity, and expiration gracefully.
+        The service is built once per token file, its credentials are shared by
+        all threads and refreshed shortly before they expire rather than after a failed request.
         
         Returns:
             googleapiclient.discovery.Resource: YouTube API service instance.
@@ -43,11 +182,11 @@ class YouTubeUpdater:
                 logger.info("Falling back to OAuth flow for new credentials.")
                 creds = None
 
-        # If no valid creds, run OAuth flow
-        if not creds or not creds.valid:
+        # If no valid creds, or they are about to expire, run OAuth flow
+        if not creds or not creds.valid or _expires_soon(creds):
             # Attempt to refresh if possible
-            if creds and creds.expired and creds.refresh_token:
-                logger.info("Credentials are expired. Attempting to refresh...")
+            if creds and creds.refresh_token:
+                logger.info("Credentials are expired or about to expire. Attempting to refresh...")
                 try:
                     creds.refresh(Request())
                     logger.info("Credentials successfully refreshed.")
@@ -65,71 +204,132 @@ class YouTubeUpdater:
 
             # Save the new credentials
             try:
-                with open(self.token_file, 'w') as token:
-                    token.write(creds.to_json())
+                self._save_credentials(creds)
                 logger.info(f"Credentials stored at {self.token_file}.")
             except Exception as e:
                 logger.error(f"Failed to save credentials to {self.token_file}: {e}")
 
         # Build and return the service
-        service = build('youtube', 'v3', credentials=creds)
+        creds = _SharedCredentials.from_credentials(creds, self.scopes)
+        creds.on_refresh = self._store_refreshed_credentials
+        service = build(
+            'youtube', 'v3',
+            http=AuthorizedHttp(creds, http=httplib2.Http()),
+            requestBuilder=_thread_local_request_builder(creds)
+        )
         logger.info("YouTube service successfully authenticated and built.")
         return service
 
+    def _store_refreshed_credentials(self, creds):
+        """
+        Writes credentials refreshed while the service is in use back to the token file.
+
+        Args:
+            creds (Credentials): Refreshed credentials.
+        """
+        try:
+            self._save_credentials(creds)
+            logger.info(f"Refreshed credentials stored at {self.token_file}.")
+        except Exception as e:
+            logger.error(f"Failed to save refreshed credentials to {self.token_file}: {e}")
+
+    def _save_credentials(self, creds):
+        """
+        Writes credentials to the token file atomically, readable only by the current user.
 
-    def get_video_details(self, video_id):
+        Args:
+            creds (Credentials): Credentials to store.
+        """
+        temp_path = f"{self.token_file}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, 'w') as token:
+                token.write(creds.to_json())
+            os.replace(temp_path, self.token_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+    def get_video_details(self, video_id, part='snippet', fields=SNIPPET_FIELDS):
         """
         Retrieves details of a YouTube video by ID.
+        By default only the writable snippet fields are requested, which is all
+        an update needs and keeps the response small.
 
         Args:
             video_id (str): YouTube video ID.
+            part (str): Resource parts to request.
+            fields (str): Partial response selector, or None for complete parts.
 
         Returns:
             dict: Video details.
         """
-        try:
-            request = self.service.videos().list(
-                part='snippet,contentDetails,statistics,status',
-                id=video_id
-            )
-            response = request.execute()
-            if response['items']:
-                return response['items'][0]
+        video_details = self.get_video_details_bulk([video_id], part=part, fields=fields).get(video_id)
+        if video_details is None:
             logger.error(f"No details found for video ID: {video_id}")
-            return None
-        except Exception as e:
-            logger.error(f"Error retrieving video details: {e}")
-            return None
+        return video_details
+
+    def get_video_details_bulk(self, video_ids, part='snippet', fields=SNIPPET_FIELDS):
+        """
+        Retrieves details of several YouTube videos, up to 50 IDs per request.
+
+        Args:
+            video_ids (list): YouTube video IDs.
+            part (str): Resource parts to request.
+            fields (str): Partial response selector, must include the item id, or None for complete parts.
 
-    def get_video_language(self, video_id):
+        Returns:
+            dict: Video ID mapped to its details, videos that were not found are left out.
+        """
+        video_ids = list(dict.fromkeys(video_ids))  # Drop duplicates, keep order
+        details = {}
+        for i in range(0, len(video_ids), MAX_IDS_PER_REQUEST):
+            chunk = video_ids[i:i + MAX_IDS_PER_REQUEST]
+            try:
+                request = self.service.videos().list(
+                    part=part,
+                    id=','.join(chunk),
+                    maxResults=MAX_IDS_PER_REQUEST,
+                    **({'fields': fields} if fields else {})
+                )
+                response = self._execute_with_retry(request)
+                for item in response.get('items', []):
+                    details[item['id']] = item
+                    if part == 'snippet' and fields == SNIPPET_FIELDS:
+                        # Only complete snippets are cached, update_video writes them back
+                        self._details_cache[item['id']] = item
+            except Exception as e:
+                logger.error(f"Error retrieving video details: {e}")
+        return details
+
+    def get_video_language(self, video_id, video_details=None):
         """
         Retrieves the language of a YouTube video.
 
         Args:
             video_id (str): YouTube video ID.
+            video_details (dict): Already fetched video details (optional), saves an API call.
 
         Returns:
             str: The default language of the video (e.g., 'en'), or None if not set.
         """
-        try:
-            request = self.service.videos().list(
-                part='snippet',
-                id=video_id
-            )
-            response = request.execute()
-            if response['items']:
-                video_snippet = response['items'][0]['snippet']
-                return video_snippet.get('defaultLanguage', None)  # Returns 'en', 'es', etc.
-            logger.error(f"No details found for video ID: {video_id}")
-            return None
-        except Exception as e:
-            logger.error(f"Error retrieving video language: {e}")
+        if video_details is None:
+            video_details = self._details_cache.get(video_id)
+        if video_details is None:
+            video_details = self.get_video_details(video_id, fields='items(id,snippet/defaultLanguage)')
+        if not video_details:
             return None
+        return video_details.get('snippet', {}).get('defaultLanguage', None)  # Returns 'en', 'es', etc.
 
 
-    def update_video(self, video_id, title=None, description=None, tags=None, category_id=None):
+    def update_video(self, video_id, title=None, description=None, tags=None, category_id=None, snippet=None, defer=False):
         """
         Updates a YouTube video's metadata.
+        The update replaces the whole snippet, so the given fields are laid over
+        the current snippet: the one passed in, the one already fetched by this
+        updater, or otherwise a freshly fetched one.
 
         Args:
             video_id (str): YouTube video ID.
@@ -137,15 +337,25 @@ class YouTubeUpdater:
             description (str): New video description (optional).
             tags (list): List of new tags (optional).
             category_id (str): New video category ID (optional).
+            snippet (dict): Current snippet of the video, when already fetched (optional).
+            defer (bool): Queue the update for the next flush_updates() batch instead of sending it now.
+
+        Returns:
+            dict: The updated video resource returned by the API (or the queued resource when deferred), or None on failure.
         """
         try:
-            # Fetch current details if necessary
-            video_details = self.get_video_details(video_id)
-            if not video_details:
-                logger.error(f"Video ID '{video_id}' not found.")
-                return
+            if snippet is None:
+                cached = self._details_cache.get(video_id)
+                snippet = cached.get('snippet') if cached else None
+            if snippet is None:
+                # Fetch current details so fields that are not given keep their values
+                video_details = self.get_video_details(video_id)
+                if not video_details:
+                    logger.error(f"Video ID '{video_id}' not found.")
+                    return None
+                snippet = video_details['snippet']
+            snippet = dict(snippet)  # Leave the caller's and the cached copy untouched
 
-            snippet = video_details['snippet']
             if title:
                 snippet['title'] = title
             if description:
@@ -157,55 +367,169 @@ class YouTubeUpdater:
 
             request = self.service.videos().update(
                 part='snippet',
-                body={'id': video_id, 'snippet': snippet}
+                body={'id': video_id, 'snippet': snippet},
+                fields='id,snippet/defaultLanguage'  # Only what callers read back
             )
-            response = request.execute()
-            logger.info(f"Updated video '{title or snippet['title']}' (ID: {video_id})")
+            if defer:
+                with self._pending_lock:
+                    self._pending_updates.append((video_id, request, snippet))
+                logger.info(f"Queued update for video '{snippet.get('title')}' (ID: {video_id})")
+                return {'id': video_id, 'snippet': snippet}
+
+            response = self._execute_with_retry(request)
+            self._details_cache[video_id] = {'id': video_id, 'snippet': snippet}
+            logger.info(f"Updated video '{snippet.get('title')}' (ID: {video_id})")
+            return response
         except Exception as e:
             logger.error(f"Error updating video: {e}")
+            return None
 
-    def process_update_youtube(self, folder):
+    def flush_updates(self):
         """
-        Processes YouTube updates based on folder contents.
+        Sends all queued video updates as batch requests.
+
+        Returns:
+            list: IDs of the videos whose update failed.
+        """
+        with self._pending_lock:
+            pending, self._pending_updates = self._pending_updates, []
+        snippets = {video_id: snippet for video_id, _, snippet in pending}
+        done = {}
+        callback = functools.partial(self._on_update_response, snippets, done)
+        for i in range(0, len(pending), MAX_BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for video_id, request, _ in pending[i:i + MAX_BATCH_SIZE]:
+                batch.add(request, request_id=video_id)
+            try:
+                batch.execute()
+            except Exception as e:
+                logger.error(f"Error sending batched video updates: {e}")
+        # Updates without a response, e.g. when a whole batch failed, count as failed
+        return [video_id for video_id in snippets if not done.get(video_id)]
+
+    def _on_update_response(self, snippets, done, request_id, response, exception):
+        """
+        Records the outcome of one batched video update and caches the sent snippet when it succeeded.
+        """
+        done[request_id] = exception is None
+        if exception is not None:
+            logger.error(f"Error updating video {request_id}: {exception}")
+        else:
+            self._details_cache[request_id] = {'id': request_id, 'snippet': snippets[request_id]}
+            logger.info(f"Updated video (ID: {request_id})")
+
+    def process_folders(self, folders, max_workers=8):
+        """
+        Processes YouTube updates for several folders, fetching the current
+        details of all their videos in bulk first and then handling the
+        folders concurrently.
 
         Args:
-            folder (str): Folder containing metadata files.
+            folders (list): Folders containing metadata files.
+            max_workers (int): Maximum number of folders processed at the same time.
+
+        Returns:
+            list: IDs of the videos that were not found or whose metadata update failed.
+        """
+        youtube_ids = {}
+        for folder in folders:
+            youtube_id = self._read_folder_youtube_id(folder)
+            if youtube_id:
+                youtube_ids[folder] = youtube_id
+
+        details = self.get_video_details_bulk(youtube_ids.values())
+        failed = []
+        try:
+            # API calls are network bound, so folders overlap well in threads
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {}
+                for folder, youtube_id in youtube_ids.items():
+                    video_details = details.get(youtube_id)
+                    if video_details is None:
+                        logger.error(f"Video ID '{youtube_id}' not found.")
+                        failed.append(youtube_id)
+                        continue
+                    future = executor.submit(
+                        self.process_update_youtube, folder, video_details=video_details, defer_update=True
+                    )
+                    futures[future] = folder
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Error updating YouTube from folder {futures[future]}: {e}")
+        finally:
+            # Metadata updates of all folders go out together
+            failed.extend(self.flush_updates())
+        if failed:
+            logger.error(f"Failed to update {len(failed)} of {len(youtube_ids)} videos: {', '.join(failed)}")
+        return failed
+
+    def _read_folder_youtube_id(self, folder):
+        """
+        Reads the YouTube ID of a processed folder, logging why when it is missing.
+
+        Args:
+            folder (str): Folder containing file_details.txt.
+
+        Returns:
+            str: YouTube ID, or None if not found.
         """
         file_details_path = os.path.join(folder, 'file_details.txt')
         if not os.path.exists(file_details_path):
             logger.error(f"file_details.txt not found in folder: {folder}")
-            return
+            return None
 
         # Read YouTube ID from file_details.txt
         youtube_id = self.get_youtube_id_from_file(file_details_path)
         if not youtube_id:
             logger.error("YouTube ID not found in file_details.txt.")
+            return None
+        return youtube_id
+
+    def process_update_youtube(self, folder, video_details=None, defer_update=False):
+        """
+        Processes YouTube updates based on folder contents.
+
+        Args:
+            folder (str): Folder containing metadata files.
+            video_details (dict): Current details of the folder's video, when already fetched (optional).
+            defer_update (bool): Queue the metadata update for flush_updates() instead of sending it now.
+        """
+        youtube_id = self._read_folder_youtube_id(folder)
+        if not youtube_id:
             return
 
-        # Load metadata
-        title = load_variable_content('title',folder)
-        description = load_variable_content('description',folder)
-        tags = load_variable_content('keywords',folder) 
+        # Load metadata, all variables come from one directory scan
+        variables = load_variables_content(('title', 'description', 'keywords'), folder)
+        title = variables['title']
+        description = variables['description']
+        tags = variables['keywords']
         if tags:
             tags = limit_tags_to_500_chars(tags)
             
         # Update video metadata
-        self.update_video(
+        video_details = self.update_video(
             video_id=youtube_id,
             title=title if title else None,
             description=description if description else None,
             tags=tags if tags else None,
-            category_id=None  # Optionally, include category logic
+            category_id=None,  # Optionally, include category logic
+            snippet=video_details['snippet'] if video_details else None,
+            defer=defer_update
         )
 
         srt_file_path = os.path.join(folder, 'transcript.srt')
         if os.path.exists(srt_file_path):
-            video_language = self.get_video_language(youtube_id) or 'en'
+            # Reuse the video returned by the update instead of requesting it again
+            video_language = self.get_video_language(youtube_id, video_details) or 'en'
             self.upload_subtitles(youtube_id, srt_file_path, video_language)
 
     def upload_subtitles(self, video_id, srt_file_path, language):
         """
-        Uploads subtitles to a YouTube video.
+        Uploads subtitles to a YouTube video, replacing its captions in the same language.
+        The upload is skipped when the same file was already uploaded for this
+        video and language, as recorded in the '.etag' file next to the SRT file.
 
         Args:
             video_id (str): YouTube video ID.
@@ -213,14 +537,57 @@ class YouTubeUpdater:
             language (str): Language of the subtitles.
         """
         try:
-            # Remove existing captions
-            captions = self.service.captions().list(part='snippet', videoId=video_id).execute()
-            for caption in captions.get('items', []):
-                self.service.captions().delete(id=caption['id']).execute()
-                logger.info(f"Deleted caption: {caption['id']}")
-
-            # Upload new captions
-            media = MediaFileUpload(srt_file_path, mimetype='application/octet-stream')
+            etag_file = f"{srt_file_path}.etag"
+            digest = hashlib.sha256(Path(srt_file_path).read_bytes()).hexdigest()
+            etag = f"{video_id} {language} {digest}"
+            if load_file_content(etag_file) == etag:
+                logger.info(f"Subtitles for {video_id} are unchanged, skipping upload")
+                return
+
+            # Remove existing captions in the same language, others are kept
+            captions = self._execute_with_retry(self.service.captions().list(
+                part='snippet', videoId=video_id, fields='items(id,snippet/language)'
+            ))
+            captions['items'] = [
+                caption for caption in captions.get('items', [])
+                if caption['snippet'].get('language') == language
+            ]
+            if captions['items']:
+                deleted = set()
+
+                def on_deleted(request_id, response, exception):
+                    if exception is not None:
+                        logger.error(f"Error deleting caption {request_id}: {exception}")
+                    else:
+                        deleted.add(request_id)
+                        logger.info(f"Deleted caption: {request_id}")
+
+                # Send all deletes in a single batch request
+                batch = self.service.new_batch_http_request(callback=on_deleted)
+                for caption in captions['items']:
+                    batch.add(self.service.captions().delete(id=caption['id']), request_id=caption['id'])
+                try:
+                    batch.execute()
+                except Exception as e:
+                    logger.error(f"Error sending batched caption deletes: {e}")
+
+                # Delete whatever the batch did not one by one, the upload goes ahead either way
+                for caption in captions['items']:
+                    if caption['id'] in deleted:
+                        continue
+                    try:
+                        self._execute_with_retry(self.service.captions().delete(id=caption['id']))
+                        logger.info(f"Deleted caption: {caption['id']}")
+                    except Exception as e:
+                        logger.error(f"Error deleting caption {caption['id']}: {e}")
+
+            # Upload new captions. Files larger than one chunk go through a resumable
+            # session, so a transient error only repeats the current chunk
+            resumable = os.path.getsize(srt_file_path) > UPLOAD_CHUNK_SIZE
+            media = MediaFileUpload(
+                srt_file_path, mimetype='application/octet-stream',
+                chunksize=UPLOAD_CHUNK_SIZE, resumable=resumable
+            )
             request = self.service.captions().insert(
                 part='snippet',
                 body={
@@ -233,15 +600,39 @@ class YouTubeUpdater:
                 },
                 media_body=media
             )
-            response = request.execute()
+            # googleapiclient retries 5xx and 429 responses with exponential backoff
+            if resumable:
+                response = None
+                while response is None:
+                    status, response = request.next_chunk(num_retries=API_RETRIES)
+                    if status:
+                        logger.info(f"Uploaded {int(status.progress() * 100)}% of subtitles for {video_id}")
+            else:
+                response = self._execute_with_retry(request)
             logger.info(f"Subtitles uploaded successfully: {response['id']}")
+            save_file_content(etag_file, etag)
         except Exception as e:
             logger.error(f"Error uploading subtitles: {e}")
 
+    @staticmethod
+    def _execute_with_retry(request):
+        """
+        Executes an API request, retrying transient failures.
+        googleapiclient sleeps with jittered exponential backoff between attempts
+        and only retries 5xx, 429 and rate limit 403 responses.
+
+        Args:
+            request (googleapiclient.http.HttpRequest): Request to execute.
+
+        Returns:
+            dict: Response of the request.
+        """
+        return request.execute(num_retries=API_RETRIES)
+
     @staticmethod
     def get_youtube_id_from_file(file_path):
         """
-        Extracts the YouTube ID from file_details.txt.
+        Extracts the YouTube ID from file_details.txt, reusing the result while the file is unchanged.
 
         Args:
             file_path (str): Path to file_details.txt.
@@ -250,11 +641,8 @@ class YouTubeUpdater:
             str: YouTube ID, or None if not found.
         """
         try:
-            with open(file_path, 'r') as file:
-                for line in file:
-                    if line.startswith('youtube_id='):
-                        return line.split('=')[1].strip()
-            return None
+            stat = os.stat(file_path)
+            return _read_youtube_id_versioned(file_path, stat.st_mtime_ns, stat.st_size)
         except Exception as e:
             logger.error(f"Error reading YouTube ID from file: {e}")
             return None